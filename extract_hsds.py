@@ -5,8 +5,8 @@ Extracts Human Services Data Specification (HSDS) compliant data from a communit
 """
 
 import os
-import json
 import sys
+import traceback
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
@@ -19,6 +19,15 @@ from baml_py import Image
 # Load environment variables from .env file if it exists
 load_dotenv()
 
+# Supported image extensions and their MIME types (unknown ones default to JPEG)
+_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp'
+}
+
 
 def load_image_from_file(image_path: str) -> Image:
     """
@@ -31,35 +40,22 @@ def load_image_from_file(image_path: str) -> Image:
         BAML Image object with base64-encoded data
     """
     import base64
-    import mimetypes
-    
-    image_path = Path(image_path).resolve()
-    
-    if not image_path.exists():
-        raise FileNotFoundError(f"Image file not found: {image_path}")
     
     print(f"Loading image from: {image_path}")
     
     # Detect MIME type from file extension
-    mime_type, _ = mimetypes.guess_type(str(image_path))
-    if not mime_type or not mime_type.startswith('image/'):
-        # Default to common image types
-        ext = image_path.suffix.lower()
-        mime_map = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp'
-        }
-        mime_type = mime_map.get(ext, 'image/jpeg')
-    
-    # Read and encode image as base64
-    with open(image_path, 'rb') as f:
-        image_data = f.read()
-        base64_data = base64.b64encode(image_data).decode('utf-8')
-    
-    print(f"Encoded image as base64 ({len(base64_data)} chars, MIME: {mime_type})")
+    mime_type = _MIME_TYPES.get(os.path.splitext(image_path)[1].lower(), 'image/jpeg')
+    
+    # Read and encode image as base64 (baml_py.Image only accepts URLs or
+    # base64 payloads, so the encoding step can't be skipped). Opening the
+    # file directly doubles as the existence check.
+    try:
+        with open(image_path, 'rb') as f:
+            base64_data = base64.b64encode(f.read()).decode('ascii')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Image file not found: {image_path}") from None
+    
+    print(f"Encoded image as base64 (MIME: {mime_type})")
     
     # Create Image from base64 data
     img = Image.from_base64(mime_type, base64_data)
@@ -96,85 +92,89 @@ def extract_hsds_data(image_path: str) -> HSDSData:
     return hsds_data
 
 
-def hsds_to_dict(hsds_data: HSDSData) -> dict:
+def format_summary(hsds_data: HSDSData) -> str:
     """
-    Convert HSDS Pydantic model to a dictionary for JSON serialization.
+    Build a human-readable summary of the extracted HSDS data.
     
     Args:
         hsds_data: HSDS data object
         
     Returns:
-        Dictionary representation
+        The summary text, ready to be written in one go
     """
-    # Pydantic v2 uses model_dump()
-    return hsds_data.model_dump()
-
-
-def print_summary(hsds_data: HSDSData):
-    """
-    Print a human-readable summary of the extracted HSDS data.
-    """
-    print("=" * 80)
-    print("HSDS DATA EXTRACTION SUMMARY")
-    print("=" * 80)
+    parts = []
+    add = parts.append
+    
+    add("=" * 80 + "\n")
+    add("HSDS DATA EXTRACTION SUMMARY\n")
+    add("=" * 80 + "\n")
     
-    print(f"\nORGANIZATION")
-    print(f"   Name: {hsds_data.organization.name}")
-    print(f"   Description: {hsds_data.organization.description}")
+    add("\nORGANIZATION\n")
+    add(f"   Name: {hsds_data.organization.name}\n")
+    add(f"   Description: {hsds_data.organization.description}\n")
     if hsds_data.organization.url:
-        print(f"   Website: {hsds_data.organization.url}")
+        add(f"   Website: {hsds_data.organization.url}\n")
     
-    print(f"\nSERVICES & LOCATIONS ({len(hsds_data.services_at_locations)} found)")
+    add(f"\nSERVICES & LOCATIONS ({len(hsds_data.services_at_locations)} found)\n")
     
     for idx, sal in enumerate(hsds_data.services_at_locations, 1):
-        print(f"\n   [{idx}] SERVICE: {sal.service.name}")
-        print(f"       Description: {sal.service.description}")
-        print(f"       Status: {sal.service.status}")
+        add(f"\n   [{idx}] SERVICE: {sal.service.name}\n")
+        add(f"       Description: {sal.service.description}\n")
+        add(f"       Status: {sal.service.status}\n")
         
         if sal.service.eligibility:
-            print(f"       Eligibility: {sal.service.eligibility}")
+            add(f"       Eligibility: {sal.service.eligibility}\n")
         
         if sal.service.fees:
-            print(f"       Fees: {sal.service.fees}")
+            add(f"       Fees: {sal.service.fees}\n")
         
         if sal.service.schedules:
-            print(f"       Schedules:")
+            add("       Schedules:\n")
             for schedule in sal.service.schedules:
-                print(f"         - {schedule.description or 'Schedule'}")
-                print(f"           Frequency: {schedule.freq}")
+                add(f"         - {schedule.description or 'Schedule'}\n")
+                add(f"           Frequency: {schedule.freq}\n")
                 if schedule.byday:
-                    print(f"           Days: {schedule.byday}")
-                print(f"           Hours: {schedule.opens_at} - {schedule.closes_at}")
+                    add(f"           Days: {schedule.byday}\n")
+                add(f"           Hours: {schedule.opens_at} - {schedule.closes_at}\n")
         
         if sal.service.phones:
-            print(f"       Phone Numbers:")
+            add("       Phone Numbers:\n")
             for phone in sal.service.phones:
-                print(f"         - {phone.number} ({phone.phone_type})")
+                add(f"         - {phone.number} ({phone.phone_type})\n")
         
-        print(f"\n       LOCATION: {sal.location.name}")
+        add(f"\n       LOCATION: {sal.location.name}\n")
         if sal.location.description:
-            print(f"          Description: {sal.location.description}")
+            add(f"          Description: {sal.location.description}\n")
         
         if sal.location.addresses:
             for addr in sal.location.addresses:
-                print(f"          Address: {addr.address_1}")
-                print(f"                   {addr.city}, {addr.state_province} {addr.postal_code}")
-                print(f"                   Type: {addr.address_type}")
+                add(f"          Address: {addr.address_1}\n")
+                add(f"                   {addr.city}, {addr.state_province} {addr.postal_code}\n")
+                add(f"                   Type: {addr.address_type}\n")
+    
+    add("\n" + "=" * 80 + "\n")
     
-    print("\n" + "=" * 80)
+    return "".join(parts)
+
+
+def print_summary(hsds_data: HSDSData):
+    """
+    Print a human-readable summary of the extracted HSDS data.
+    """
+    sys.stdout.write(format_summary(hsds_data))
+    sys.stdout.flush()
 
 
 def save_to_json(hsds_data: HSDSData, output_path: str):
     """
     Save the extracted HSDS data to a JSON file.
     """
-    data_dict = hsds_to_dict(hsds_data)
-    
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data_dict, f, indent=2, ensure_ascii=False)
+    # Serialize with Pydantic v2's native JSON encoder rather than
+    # model_dump() + json.dump, which walks the whole tree twice in Python
+    output_path.write_text(hsds_data.model_dump_json(indent=2), encoding='utf-8')
     
     print(f"\nHSDS data saved to: {output_path}")
 
@@ -206,8 +206,9 @@ def main():
         
     except Exception as e:
         print(f"\nError: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+        # Full tracebacks only when debugging (set HSDS_DEBUG=1)
+        if os.getenv("HSDS_DEBUG"):
+            traceback.print_exc()
         sys.exit(1)
 
 